@@ -1,83 +1,202 @@
 """
 Flask Weight Monitor Web Application - Multi-Machine Support
-Supports multiple machines with separate weight files
+Supports multiple machines stored in a single SQLite database
 Deploy to Render.com
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
 from flask_cors import CORS
+from flask_compress import Compress
 from datetime import datetime
 import os
-import json
+import math
+import sqlite3
+import hashlib
+import threading
+import time
+import orjson
 
 app = Flask(__name__)
+# Skip key sorting and indentation for any response still built by jsonify
+app.json.sort_keys = False
+app.json.compact = True
+# Static assets are versioned via query string, so let browsers cache them long
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+# Compress JSON/HTML/static responses; tiny payloads aren't worth the framing
+app.config['COMPRESS_MIMETYPES'] = [
+    'application/json',
+    'text/html',
+    'text/css',
+    'text/javascript',
+    'application/javascript'
+]
+app.config['COMPRESS_MIN_SIZE'] = 500
 CORS(app)
+Compress(app)
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 DATA_DIR = 'machine_data'  # Directory to store weight data for each machine
+DB_PATH = os.path.join(DATA_DIR, 'weights.db')
 
 # Create data directory if it doesn't exist
 if not os.path.exists(DATA_DIR):
     os.makedirs(DATA_DIR)
 
+# Single shared connection used for persistence only: reads are served from
+# the in-memory MACHINES registry, so the lock just serializes writers and the
+# one-off startup import/load. WAL gives atomic upserts without rewriting files.
+_DB = sqlite3.connect(DB_PATH, check_same_thread=False)
+_DB.execute('PRAGMA journal_mode=WAL')
+_DB.execute('PRAGMA synchronous=NORMAL')
+_DB.execute(
+    'CREATE TABLE IF NOT EXISTS weights ('
+    'machine_id TEXT PRIMARY KEY, weight REAL, ts TEXT, last_updated TEXT)'
+)
+_DB.commit()
+_DB_LOCK = threading.Lock()
+
+# In-memory registry of machines with data: machine_id -> summary dict
+MACHINES = {}
+_MACHINES_LOCK = threading.Lock()
+
+# Serialized "no data" responses per machine; bounded since IDs come from URLs
+_NODATA_CACHE = {}
+NODATA_CACHE_MAX = 256
+
+# Single condition notified on every save; SSE streams wait on it and check
+# whether their own machine changed (no per-URL state to grow unbounded)
+_UPDATED = threading.Condition()
+# Each open stream holds a server thread, and a dropped client is only noticed
+# on the next write, so keep the keepalive short and cap concurrent streams at
+# half the gunicorn thread pool (WEB_THREADS, set in gunicorn.conf.py) to leave
+# room for regular requests. Switching machines in the UI abandons the old
+# stream, which keeps its slot for up to SSE_KEEPALIVE seconds, so one user
+# clicking through all machines briefly holds several slots.
+SSE_KEEPALIVE = 5
+WEB_THREADS = int(os.environ.get('WEB_THREADS', 32))
+SSE_MAX_STREAMS = max(1, WEB_THREADS // 2)
+_STREAM_SLOTS = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+# Serialized /api/health payload, rebuilt at most once per HEALTH_TTL seconds
+HEALTH_TTL = 1.0
+_HEALTH = {'payload': None, 'ts': 0.0}
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def get_machine_file(machine_id):
-    """Get the file path for a specific machine."""
-    return os.path.join(DATA_DIR, f'machine_{machine_id}.json')
+def ojsonify(obj, status=200):
+    """Serialize obj with orjson and wrap it in a JSON response."""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
 
 def save_weight_data(machine_id, weight):
-    """Save weight data for a specific machine."""
+    """Save weight data for a specific machine.
+    
+    Returns (success, timestamp) where timestamp is the ISO string stored.
+    """
+    now = datetime.now()
     data = {
         'machine_id': machine_id,
         'weight': weight,
-        'timestamp': datetime.now().isoformat(),
-        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        'timestamp': now.isoformat(),
+        'last_updated': now.strftime('%Y-%m-%d %H:%M:%S')
     }
     
     try:
-        file_path = get_machine_file(machine_id)
-        with open(file_path, 'w') as f:
-            json.dump(data, f)
-        return True
+        with _DB_LOCK:
+            _DB.execute(
+                'INSERT OR REPLACE INTO weights (machine_id, weight, ts, last_updated) '
+                'VALUES (?, ?, ?, ?)',
+                (machine_id, weight, data['timestamp'], data['last_updated'])
+            )
+            _DB.commit()
+            # Update the registry and wake streams while still holding the
+            # write lock, so concurrent saves can't leave it on an older value
+            with _MACHINES_LOCK:
+                MACHINES[machine_id] = {
+                    'weight': weight,
+                    'timestamp': data['timestamp'],
+                    'last_updated': data['last_updated']
+                }
+            _NODATA_CACHE.pop(machine_id, None)
+            with _UPDATED:
+                _UPDATED.notify_all()
+        return True, data['timestamp']
     except Exception as e:
         print(f"Error saving data for machine {machine_id}: {e}")
-        return False
+        return False, None
 
 def load_weight_data(machine_id):
-    """Load weight data for a specific machine."""
+    """Load weight data for a specific machine from the in-memory registry."""
+    with _MACHINES_LOCK:
+        entry = MACHINES.get(machine_id)
+        if entry is None:
+            return None
+        return {'machine_id': machine_id, **entry}
+
+def import_json_files():
+    """Import legacy machine_<id>.json files into the database (run once at startup)."""
+    try:
+        with os.scandir(DATA_DIR) as it:
+            entries = [
+                e for e in it
+                if e.name.startswith('machine_') and e.name.endswith('.json')
+                and e.is_file()
+            ]
+    except Exception as e:
+        print(f"Error scanning machine files: {e}")
+        return
+    
+    with _DB_LOCK:
+        for entry in entries:
+            machine_id = entry.name[len('machine_'):-len('.json')]
+            try:
+                with open(entry.path, 'rb') as f:
+                    data = orjson.loads(f.read())
+                # Never overwrite a row that was written through the database
+                _DB.execute(
+                    'INSERT OR IGNORE INTO weights (machine_id, weight, ts, last_updated) '
+                    'VALUES (?, ?, ?, ?)',
+                    (machine_id, data['weight'], data.get('timestamp'),
+                     data.get('last_updated', 'Unknown'))
+                )
+            except Exception as e:
+                print(f"Error importing {entry.name}: {e}")
+        _DB.commit()
+
+def load_machine_registry():
+    """Populate the machine registry from the database (run once at startup)."""
     try:
-        file_path = get_machine_file(machine_id)
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        return None
+        with _DB_LOCK:
+            rows = _DB.execute(
+                'SELECT machine_id, weight, ts, last_updated FROM weights'
+            ).fetchall()
+        with _MACHINES_LOCK:
+            for machine_id, weight, ts, last_updated in rows:
+                MACHINES[machine_id] = {
+                    'weight': weight,
+                    'timestamp': ts,
+                    'last_updated': last_updated
+                }
     except Exception as e:
-        print(f"Error loading data for machine {machine_id}: {e}")
-        return None
+        print(f"Error loading machine registry: {e}")
 
 def get_all_machines():
     """Get list of all machines with data."""
-    machines = []
-    try:
-        for filename in os.listdir(DATA_DIR):
-            if filename.startswith('machine_') and filename.endswith('.json'):
-                machine_id = filename.replace('machine_', '').replace('.json', '')
-                data = load_weight_data(machine_id)
-                if data:
-                    machines.append({
-                        'machine_id': machine_id,
-                        'weight': data['weight'],
-                        'last_updated': data.get('last_updated', 'Unknown')
-                    })
-        return machines
-    except Exception as e:
-        print(f"Error getting machines: {e}")
-        return []
+    with _MACHINES_LOCK:
+        return [
+            {
+                'machine_id': k,
+                'weight': v['weight'],
+                'last_updated': v['last_updated']
+            }
+            for k, v in MACHINES.items()
+        ]
+
+import_json_files()
+load_machine_registry()
 
 # ============================================================================
 # HTML Template
@@ -90,292 +209,7 @@ HTML_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Weight Monitor - Multi-Machine</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            padding: 20px;
-        }
-        
-        .container {
-            background: white;
-            border-radius: 24px;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-            padding: 40px;
-            max-width: 480px;
-            width: 100%;
-        }
-        
-        .header {
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        
-        .icon {
-            font-size: 48px;
-            margin-bottom: 10px;
-        }
-        
-        h1 {
-            color: #333;
-            font-size: 28px;
-            margin-bottom: 8px;
-        }
-        
-        .subtitle {
-            color: #666;
-            font-size: 14px;
-        }
-        
-        .machine-selector {
-            background: #f8f9fa;
-            border-radius: 12px;
-            padding: 20px;
-            margin-bottom: 20px;
-        }
-        
-        .machine-label {
-            font-size: 12px;
-            text-transform: uppercase;
-            color: #6c757d;
-            letter-spacing: 1px;
-            margin-bottom: 10px;
-            font-weight: 600;
-        }
-        
-        .machine-buttons {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 10px;
-        }
-        
-        .machine-btn {
-            padding: 12px;
-            border: 2px solid #dee2e6;
-            background: white;
-            border-radius: 10px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 600;
-            transition: all 0.2s;
-            color: #495057;
-        }
-        
-        .machine-btn:hover {
-            border-color: #667eea;
-            transform: translateY(-2px);
-        }
-        
-        .machine-btn.active {
-            background: #667eea;
-            color: white;
-            border-color: #667eea;
-        }
-        
-        .status-bar {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 10px;
-            margin-bottom: 30px;
-            padding: 12px;
-            background: #f8f9fa;
-            border-radius: 12px;
-        }
-        
-        .status-dot {
-            width: 10px;
-            height: 10px;
-            border-radius: 50%;
-            background: #6c757d;
-        }
-        
-        .status-dot.success {
-            background: #28a745;
-            animation: pulse 2s infinite;
-        }
-        
-        .status-dot.waiting {
-            background: #ffc107;
-        }
-        
-        .status-dot.error {
-            background: #dc3545;
-        }
-        
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        
-        .status-text {
-            color: #495057;
-            font-size: 14px;
-            font-weight: 500;
-        }
-        
-        .weight-card {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 20px;
-            padding: 40px 20px;
-            text-align: center;
-            color: white;
-            margin-bottom: 20px;
-            box-shadow: 0 10px 30px rgba(102, 126, 234, 0.3);
-        }
-        
-        .weight-label {
-            font-size: 12px;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-            opacity: 0.9;
-            margin-bottom: 15px;
-        }
-        
-        .weight-value {
-            font-size: 64px;
-            font-weight: 700;
-            line-height: 1;
-            margin-bottom: 5px;
-        }
-        
-        .weight-unit {
-            font-size: 24px;
-            opacity: 0.8;
-            margin-left: 5px;
-        }
-        
-        .machine-badge {
-            display: inline-block;
-            padding: 6px 16px;
-            background: rgba(255, 255, 255, 0.2);
-            border-radius: 20px;
-            font-size: 13px;
-            font-weight: 600;
-            margin-top: 10px;
-        }
-        
-        .timestamp-card {
-            background: #f8f9fa;
-            border-radius: 12px;
-            padding: 16px;
-            margin-bottom: 20px;
-        }
-        
-        .timestamp-label {
-            font-size: 11px;
-            text-transform: uppercase;
-            color: #6c757d;
-            letter-spacing: 1px;
-            margin-bottom: 6px;
-        }
-        
-        .timestamp-value {
-            color: #212529;
-            font-size: 15px;
-            font-weight: 500;
-        }
-        
-        .button-group {
-            display: flex;
-            gap: 12px;
-        }
-        
-        .btn {
-            flex: 1;
-            padding: 16px;
-            border: none;
-            border-radius: 12px;
-            font-size: 15px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.2s;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 8px;
-        }
-        
-        .btn:disabled {
-            opacity: 0.5;
-            cursor: not-allowed;
-        }
-        
-        .btn-primary {
-            background: #667eea;
-            color: white;
-        }
-        
-        .btn-primary:hover:not(:disabled) {
-            background: #5568d3;
-            transform: translateY(-2px);
-            box-shadow: 0 8px 20px rgba(102, 126, 234, 0.4);
-        }
-        
-        .btn-secondary {
-            background: #e9ecef;
-            color: #495057;
-        }
-        
-        .btn-secondary:hover:not(:disabled) {
-            background: #dee2e6;
-        }
-        
-        .btn-secondary.active {
-            background: #28a745;
-            color: white;
-        }
-        
-        .auto-info {
-            text-align: center;
-            margin-top: 12px;
-            font-size: 13px;
-            color: #6c757d;
-        }
-        
-        .no-data {
-            text-align: center;
-            padding: 60px 20px;
-            color: #6c757d;
-        }
-        
-        .no-data-icon {
-            font-size: 48px;
-            margin-bottom: 16px;
-            opacity: 0.5;
-        }
-        
-        .loading {
-            text-align: center;
-            padding: 40px;
-            color: #6c757d;
-        }
-        
-        .spinner {
-            border: 3px solid #f3f3f3;
-            border-top: 3px solid #667eea;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 16px;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-    </style>
+    <link rel="stylesheet" href="/static/app.css?v=1">
 </head>
 <body>
     <div class="container">
@@ -427,188 +261,19 @@ HTML_TEMPLATE = """
         <div class="auto-info" id="autoInfo"></div>
     </div>
 
-    <script>
-        let selectedMachine = '1';
-        let autoRefresh = false;
-        let autoInterval = null;
-        let countdown = 5;
-        let countdownInterval = null;
-
-        function selectMachine(machineId) {
-            selectedMachine = machineId;
-            
-            // Update button states
-            document.querySelectorAll('.machine-btn').forEach(btn => {
-                btn.classList.remove('active');
-            });
-            event.target.classList.add('active');
-            
-            // Load data for selected machine
-            getWeight();
-        }
-
-        async function getWeight() {
-            const btn = document.getElementById('getWeightBtn');
-            btn.disabled = true;
-            btn.innerHTML = '⏳ Loading...';
-            
-            updateStatus('loading', `Fetching Machine ${selectedMachine} data...`);
-            
-            try {
-                const response = await fetch(`/api/weight/${selectedMachine}`);
-                const data = await response.json();
-                displayWeight(data);
-            } catch (error) {
-                handleError(error);
-            }
-        }
-
-        function displayWeight(data) {
-            const btn = document.getElementById('getWeightBtn');
-            btn.disabled = false;
-            btn.innerHTML = '🔄 Get Weight';
-            
-            const contentDiv = document.getElementById('content');
-            
-            if (data.status === 'success') {
-                updateStatus('success', 'Data received');
-                
-                const date = new Date(data.timestamp);
-                const dateStr = date.toLocaleDateString('en-US', { 
-                    year: 'numeric', 
-                    month: 'long', 
-                    day: 'numeric' 
-                });
-                const timeStr = date.toLocaleTimeString('en-US', { 
-                    hour: '2-digit', 
-                    minute: '2-digit',
-                    second: '2-digit'
-                });
-                
-                contentDiv.innerHTML = `
-                    <div class="weight-card">
-                        <div class="weight-label">Current Weight</div>
-                        <div class="weight-value">
-                            ${data.weight}
-                            <span class="weight-unit">kg</span>
-                        </div>
-                        <div class="machine-badge">Machine ${data.machine_id}</div>
-                    </div>
-                    
-                    <div class="timestamp-card">
-                        <div class="timestamp-label">Last Updated</div>
-                        <div class="timestamp-value">${dateStr}</div>
-                        <div class="timestamp-value">${timeStr}</div>
-                    </div>
-                `;
-                
-                resetCountdown();
-            } else if (data.status === 'no_data') {
-                updateStatus('waiting', 'Waiting for data');
-                
-                contentDiv.innerHTML = `
-                    <div class="no-data">
-                        <div class="no-data-icon">📭</div>
-                        <p><strong>No data for Machine ${selectedMachine}</strong></p>
-                        <p style="margin-top: 8px; font-size: 13px;">
-                            ${data.message}
-                        </p>
-                    </div>
-                `;
-            } else {
-                handleError(data);
-            }
-        }
-
-        function handleError(error) {
-            const btn = document.getElementById('getWeightBtn');
-            btn.disabled = false;
-            btn.innerHTML = '🔄 Get Weight';
-            
-            updateStatus('error', 'Error occurred');
-            
-            const contentDiv = document.getElementById('content');
-            contentDiv.innerHTML = `
-                <div class="no-data">
-                    <div class="no-data-icon">⚠️</div>
-                    <p><strong>Error loading data</strong></p>
-                    <p style="margin-top: 8px; font-size: 13px;">
-                        ${error.message || 'Unknown error'}
-                    </p>
-                </div>
-            `;
-        }
-
-        function updateStatus(type, text) {
-            const dot = document.getElementById('statusDot');
-            const statusText = document.getElementById('statusText');
-            
-            dot.className = 'status-dot';
-            if (type === 'success') dot.classList.add('success');
-            else if (type === 'waiting') dot.classList.add('waiting');
-            else if (type === 'error') dot.classList.add('error');
-            
-            statusText.textContent = text;
-        }
-
-        function toggleAuto() {
-            autoRefresh = !autoRefresh;
-            const btn = document.getElementById('autoBtn');
-            
-            if (autoRefresh) {
-                btn.textContent = 'Auto: ON';
-                btn.classList.add('active');
-                startAutoRefresh();
-            } else {
-                btn.textContent = 'Auto: OFF';
-                btn.classList.remove('active');
-                stopAutoRefresh();
-            }
-        }
-
-        function startAutoRefresh() {
-            countdown = 5;
-            updateAutoInfo();
-            
-            autoInterval = setInterval(() => {
-                getWeight();
-            }, 5000);
-            
-            countdownInterval = setInterval(() => {
-                countdown--;
-                if (countdown <= 0) countdown = 5;
-                updateAutoInfo();
-            }, 1000);
-        }
-
-        function stopAutoRefresh() {
-            if (autoInterval) clearInterval(autoInterval);
-            if (countdownInterval) clearInterval(countdownInterval);
-            document.getElementById('autoInfo').textContent = '';
-        }
-
-        function resetCountdown() {
-            if (autoRefresh) {
-                countdown = 5;
-                updateAutoInfo();
-            }
-        }
-
-        function updateAutoInfo() {
-            if (autoRefresh) {
-                document.getElementById('autoInfo').textContent = 
-                    `Next refresh in ${countdown} seconds...`;
-            }
-        }
-
-        window.onload = function() {
-            getWeight();
-        };
-    </script>
+    <script src="/static/app.js?v=5"></script>
 </body>
 </html>
 """
 
+# Encode the page once; the ETag lets browsers revalidate with a 304
+HTML_BYTES = HTML_TEMPLATE.encode('utf-8')
+HTML_ETAG = hashlib.md5(HTML_BYTES).hexdigest()
+# Flask-Compress rewrites the ETag of compressed responses to "<etag>:<algo>"
+HTML_ETAGS = [HTML_ETAG] + [
+    f'{HTML_ETAG}:{algo}' for algo in ('br', 'gzip', 'deflate', 'zstd')
+]
+
 # ============================================================================
 # Routes
 # ============================================================================
@@ -616,7 +281,24 @@ HTML_TEMPLATE = """
 @app.route('/')
 def index():
     """Serve the main web page."""
-    return HTML_TEMPLATE
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        matched = HTML_ETAG
+    else:
+        matched = next(
+            (tag for tag in HTML_ETAGS if if_none_match.contains_weak(tag)),
+            None
+        )
+    
+    if matched:
+        # Echo the validator the client holds, which may carry the :<algo> suffix
+        resp = Response(status=304)
+        resp.set_etag(matched)
+    else:
+        resp = Response(HTML_BYTES, mimetype='text/html')
+        resp.set_etag(HTML_ETAG)
+    resp.headers['Cache-Control'] = 'public, max-age=3600'
+    return resp
 
 @app.route('/api/weight/<machine_id>')
 def get_weight(machine_id):
@@ -624,76 +306,158 @@ def get_weight(machine_id):
     data = load_weight_data(machine_id)
     
     if data:
-        return jsonify({
+        return ojsonify({
             'status': 'success',
             'machine_id': machine_id,
             'weight': data['weight'],
             'timestamp': data['timestamp']
         })
     
-    return jsonify({
-        'status': 'no_data',
-        'message': f'No weight data available for Machine {machine_id}'
-    })
+    buf = _NODATA_CACHE.get(machine_id)
+    if buf is None:
+        buf = orjson.dumps({
+            'status': 'no_data',
+            'message': f'No weight data available for Machine {machine_id}'
+        })
+        if len(_NODATA_CACHE) < NODATA_CACHE_MAX:
+            _NODATA_CACHE[machine_id] = buf
+    return Response(buf, mimetype='application/json')
 
 @app.route('/api/update/<machine_id>', methods=['POST'])
 def update_weight(machine_id):
     """API endpoint to receive weight updates for a specific machine."""
     try:
-        data = request.get_json()
+        try:
+            data = orjson.loads(request.get_data())
+        except orjson.JSONDecodeError:
+            data = None
         
         if not data or 'weight' not in data:
-            return jsonify({
+            return ojsonify({
                 'status': 'error',
                 'message': 'No weight data provided'
-            }), 400
+            }, 400)
         
         weight = float(data['weight'])
+        # orjson would serialize nan/inf as null, so never store them
+        if not math.isfinite(weight):
+            raise ValueError('Non-finite weight')
         
-        if save_weight_data(machine_id, weight):
-            return jsonify({
+        saved, timestamp = save_weight_data(machine_id, weight)
+        if saved:
+            return ojsonify({
                 'status': 'success',
                 'message': f'Weight updated for Machine {machine_id}',
                 'machine_id': machine_id,
                 'weight': weight,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             })
         else:
-            return jsonify({
+            return ojsonify({
                 'status': 'error',
                 'message': 'Failed to save weight data'
-            }), 500
+            }, 500)
             
     except ValueError:
-        return jsonify({
+        return ojsonify({
             'status': 'error',
             'message': 'Invalid weight format'
-        }), 400
+        }, 400)
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'status': 'error',
             'message': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/machines')
 def list_machines():
     """API endpoint to list all machines with data."""
     machines = get_all_machines()
-    return jsonify({
+    return ojsonify({
         'status': 'success',
         'machines': machines,
         'count': len(machines)
     })
 
+@app.route('/api/weights')
+def get_all_weights():
+    """API endpoint to get latest weights for all machines in one request."""
+    with _MACHINES_LOCK:
+        data = {m: dict(v) for m, v in MACHINES.items()}
+    return ojsonify({
+        'status': 'success',
+        'data': data
+    })
+
+@app.route('/api/stream/<machine_id>')
+def stream_weight(machine_id):
+    """Server-Sent Events stream pushing weight updates for a specific machine."""
+    if not _STREAM_SLOTS.acquire(blocking=False):
+        resp = ojsonify({
+            'status': 'error',
+            'message': 'Too many live streams, try again later'
+        }, 503)
+        resp.headers['Retry-After'] = str(SSE_KEEPALIVE)
+        return resp
+    
+    def event(entry):
+        if entry:
+            payload = {
+                'status': 'success',
+                'machine_id': machine_id,
+                'weight': entry['weight'],
+                'timestamp': entry['timestamp']
+            }
+        else:
+            payload = {
+                'status': 'no_data',
+                'message': f'No weight data available for Machine {machine_id}'
+            }
+        return b'data: ' + orjson.dumps(payload) + b'\n\n'
+    
+    def gen():
+        sent = MACHINES.get(machine_id)
+        yield event(sent)
+        while True:
+            with _UPDATED:
+                updated = _UPDATED.wait_for(
+                    lambda: MACHINES.get(machine_id) is not sent,
+                    timeout=SSE_KEEPALIVE
+                )
+            if updated:
+                sent = MACHINES.get(machine_id)
+                yield event(sent)
+            else:
+                # Comment line keeps idle connections open through proxies
+                yield b': keepalive\n\n'
+    
+    resp = Response(gen(), mimetype='text/event-stream')
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.headers['X-Accel-Buffering'] = 'no'
+    # Runs when the server closes the response, even if gen() never started
+    resp.call_on_close(_STREAM_SLOTS.release)
+    return resp
+
 @app.route('/api/health')
 def health_check():
     """Health check endpoint."""
-    machines = get_all_machines()
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'machines_count': len(machines)
-    })
+    now = time.monotonic()
+    if _HEALTH['payload'] is None or now - _HEALTH['ts'] > HEALTH_TTL:
+        _HEALTH['payload'] = orjson.dumps({
+            'status': 'healthy',
+            'timestamp': datetime.now(),
+            'machines_count': len(MACHINES)
+        })
+        _HEALTH['ts'] = now
+    return Response(_HEALTH['payload'], mimetype='application/json')
+
+@app.after_request
+def cache_static(response):
+    """Mark versioned static assets as immutable so browsers skip revalidation."""
+    # Errors keep default caching so a failed URL isn't pinned for a year
+    if request.path.startswith('/static/') and response.status_code in (200, 304):
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
 # ============================================================================
 # Error Handlers
@@ -701,16 +465,17 @@ def health_check():
 
 @app.errorhandler(404)
 def not_found(e):
-    return jsonify({'status': 'error', 'message': 'Endpoint not found'}), 404
+    return ojsonify({'status': 'error', 'message': 'Endpoint not found'}, 404)
 
 @app.errorhandler(500)
 def internal_error(e):
-    return jsonify({'status': 'error', 'message': 'Internal server error'}), 500
+    return ojsonify({'status': 'error', 'message': 'Internal server error'}, 500)
 
 # ============================================================================
 # Main
 # ============================================================================
 
+# Local development only; production runs under gunicorn (see gunicorn.conf.py)
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,13 @@
+"""
+Gunicorn configuration - loaded automatically from the working directory
+WEB_THREADS is the single source for the thread count; app.py reads it too
+to size the SSE stream cap, so set it via the environment to change both
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+# One process: the machine registry and SSE conditions live in process memory
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.setdefault('WEB_THREADS', '32'))
@@ -0,0 +1,197 @@
+let selectedMachine = '1';
+let autoRefresh = false;
+let eventSource = null;
+let retryTimer = null;
+
+function selectMachine(machineId) {
+    selectedMachine = machineId;
+
+    // Update button states
+    document.querySelectorAll('.machine-btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    event.target.classList.add('active');
+
+    // Load data for selected machine; a live stream sends its current state first
+    if (autoRefresh && !document.hidden) {
+        startAutoRefresh();
+    } else {
+        getWeight();
+    }
+}
+
+async function getWeight() {
+    const btn = document.getElementById('getWeightBtn');
+    btn.disabled = true;
+    btn.innerHTML = '⏳ Loading...';
+
+    updateStatus('loading', `Fetching Machine ${selectedMachine} data...`);
+
+    try {
+        const response = await fetch('/api/weights');
+        const result = await response.json();
+        const machine = result.data && result.data[selectedMachine];
+
+        if (machine) {
+            displayWeight({
+                status: 'success',
+                machine_id: selectedMachine,
+                weight: machine.weight,
+                timestamp: machine.timestamp
+            });
+        } else {
+            displayWeight({
+                status: 'no_data',
+                message: `No weight data available for Machine ${selectedMachine}`
+            });
+        }
+    } catch (error) {
+        handleError(error);
+    }
+}
+
+function displayWeight(data) {
+    const btn = document.getElementById('getWeightBtn');
+    btn.disabled = false;
+    btn.innerHTML = '🔄 Get Weight';
+
+    const contentDiv = document.getElementById('content');
+
+    if (data.status === 'success') {
+        updateStatus('success', 'Data received');
+
+        const date = new Date(data.timestamp);
+        const dateStr = date.toLocaleDateString('en-US', { 
+            year: 'numeric', 
+            month: 'long', 
+            day: 'numeric' 
+        });
+        const timeStr = date.toLocaleTimeString('en-US', { 
+            hour: '2-digit', 
+            minute: '2-digit',
+            second: '2-digit'
+        });
+
+        contentDiv.innerHTML = `
+            <div class="weight-card">
+                <div class="weight-label">Current Weight</div>
+                <div class="weight-value">
+                    ${data.weight}
+                    <span class="weight-unit">kg</span>
+                </div>
+                <div class="machine-badge">Machine ${data.machine_id}</div>
+            </div>
+
+            <div class="timestamp-card">
+                <div class="timestamp-label">Last Updated</div>
+                <div class="timestamp-value">${dateStr}</div>
+                <div class="timestamp-value">${timeStr}</div>
+            </div>
+        `;
+    } else if (data.status === 'no_data') {
+        updateStatus('waiting', 'Waiting for data');
+
+        contentDiv.innerHTML = `
+            <div class="no-data">
+                <div class="no-data-icon">📭</div>
+                <p><strong>No data for Machine ${selectedMachine}</strong></p>
+                <p style="margin-top: 8px; font-size: 13px;">
+                    ${data.message}
+                </p>
+            </div>
+        `;
+    } else {
+        handleError(data);
+    }
+}
+
+function handleError(error) {
+    const btn = document.getElementById('getWeightBtn');
+    btn.disabled = false;
+    btn.innerHTML = '🔄 Get Weight';
+
+    updateStatus('error', 'Error occurred');
+
+    const contentDiv = document.getElementById('content');
+    contentDiv.innerHTML = `
+        <div class="no-data">
+            <div class="no-data-icon">⚠️</div>
+            <p><strong>Error loading data</strong></p>
+            <p style="margin-top: 8px; font-size: 13px;">
+                ${error.message || 'Unknown error'}
+            </p>
+        </div>
+    `;
+}
+
+function updateStatus(type, text) {
+    const dot = document.getElementById('statusDot');
+    const statusText = document.getElementById('statusText');
+
+    dot.className = 'status-dot';
+    if (type === 'success') dot.classList.add('success');
+    else if (type === 'waiting') dot.classList.add('waiting');
+    else if (type === 'error') dot.classList.add('error');
+
+    statusText.textContent = text;
+}
+
+function toggleAuto() {
+    autoRefresh = !autoRefresh;
+    const btn = document.getElementById('autoBtn');
+
+    if (autoRefresh) {
+        btn.textContent = 'Auto: ON';
+        btn.classList.add('active');
+        startAutoRefresh();
+    } else {
+        btn.textContent = 'Auto: OFF';
+        btn.classList.remove('active');
+        stopAutoRefresh();
+    }
+}
+
+function startAutoRefresh() {
+    // The server pushes an event whenever the selected machine is updated
+    stopAutoRefresh();
+    eventSource = new EventSource(`/api/stream/${selectedMachine}`);
+    eventSource.onmessage = (e) => displayWeight(JSON.parse(e.data));
+    eventSource.onerror = () => {
+        if (eventSource.readyState !== EventSource.CLOSED) {
+            updateStatus('waiting', 'Reconnecting...');
+            return;
+        }
+        // The server refused the stream (e.g. 503 when full); fetch once and retry later
+        stopAutoRefresh();
+        getWeight();
+        document.getElementById('autoInfo').textContent =
+            'Live updates unavailable, retrying...';
+        retryTimer = setTimeout(() => {
+            if (autoRefresh && !document.hidden) startAutoRefresh();
+        }, 5000);
+    };
+    document.getElementById('autoInfo').textContent = 'Live updates on';
+}
+
+function stopAutoRefresh() {
+    if (eventSource) eventSource.close();
+    eventSource = null;
+    clearTimeout(retryTimer);
+    retryTimer = null;
+    document.getElementById('autoInfo').textContent = '';
+}
+
+// Pause auto refresh while the tab is hidden and resume when it is shown
+document.addEventListener('visibilitychange', () => {
+    if (!autoRefresh) return;
+
+    if (document.hidden) {
+        stopAutoRefresh();
+    } else {
+        startAutoRefresh();
+    }
+});
+
+window.onload = function() {
+    getWeight();
+};